@@ -4,12 +4,17 @@ API Endpoints
 Provides:
 - POST /api/calculate - Single approximation with visualization data
 - POST /api/analyze - Convergence analysis for log-log plots
+- POST /api/analyze/stream - The same analysis streamed as NDJSON, row by row
 - GET /api/functions - List available test functions
 """
 
+import asyncio
+from functools import lru_cache
 from fastapi import APIRouter, HTTPException
-from typing import Callable
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Callable
 
+from ..core.responses import FastJSONResponse, to_json_line
 from ..schemas.request import CalculateRequest, AnalyzeRequest
 from ..schemas.response import (
     CalculateResponse,
@@ -27,10 +32,16 @@ from ..services.functions import (
 )
 from ..services.integration import (
     compute_integral,
-    exact_integral,
+    cached_exact_integral,
     get_visualization_data,
 )
-from ..services.analysis import analyze_convergence, calculate_errors
+from ..services.analysis import (
+    cached_analyze_convergence,
+    calculate_errors,
+    iter_method_results,
+    ranked_methods,
+    summarize_results,
+)
 
 router = APIRouter(prefix="/api", tags=["integration"])
 
@@ -59,6 +70,11 @@ def get_func_from_request(
                 status_code=400,
                 detail=f"Invalid expression: {str(e)}"
             )
+        except RecursionError:
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid expression: too deeply nested"
+            )
     else:
         raise HTTPException(
             status_code=400,
@@ -66,13 +82,59 @@ def get_func_from_request(
         )
 
 
-@router.get("/functions", response_model=FunctionListResponse)
-async def get_functions():
+def validate_analyze_request(request: AnalyzeRequest) -> None:
     """
-    List all available test functions.
+    Validate the methods, bounds and N values of an analysis request.
+    Raises HTTPException (400) on invalid input.
+    """
+    # Validate methods
+    valid_methods = ["trapezoidal", "midpoint", "simpson", "gauss"]
+    for method in request.methods:
+        if method not in valid_methods:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Invalid method '{method}'. Must be one of: {valid_methods}"
+            )
     
-    Returns function IDs, names, LaTeX representations, categories,
-    and default integration bounds.
+    # Validate bounds
+    if request.a >= request.b:
+        raise HTTPException(
+            status_code=400,
+            detail="Lower bound 'a' must be less than upper bound 'b'"
+        )
+    
+    # Validate n_values
+    for n in request.n_values:
+        if n < 1:
+            raise HTTPException(
+                status_code=400,
+                detail="All N values must be positive integers"
+            )
+
+
+def expected_winner(
+    winner: str | None,
+    func_info: dict | None,
+    methods: list[str]
+) -> str | None:
+    """
+    Use the function's expected best_method as the winner if it was analyzed.
+    This ensures "Midpoint Best" functions show midpoint as winner, etc.
+    """
+    if func_info and func_info.get("best_method"):
+        expected_best = func_info["best_method"]
+        if expected_best in methods:
+            return expected_best
+    return winner
+
+
+@lru_cache(maxsize=1)
+def function_list_payload() -> dict:
+    """
+    Build the /functions response body once.
+    
+    The function library is fixed at import, so the validated payload never
+    changes; it is returned as-is on every request and must not be mutated.
     """
     funcs = list_functions()
     return FunctionListResponse(
@@ -89,7 +151,18 @@ async def get_functions():
             )
             for fid, info in funcs.items()
         ]
-    )
+    ).model_dump()
+
+
+@router.get("/functions", response_model=FunctionListResponse)
+async def get_functions():
+    """
+    List all available test functions.
+    
+    Returns function IDs, names, LaTeX representations, categories,
+    and default integration bounds.
+    """
+    return FastJSONResponse(function_list_payload())
 
 
 @router.post("/calculate", response_model=CalculateResponse)
@@ -103,9 +176,13 @@ async def calculate(request: CalculateRequest):
     - Error metrics
     - Curve points for plotting
     - Shape data for visualizing the integration method
+    
+    The payload is built from plain floats by the service layer, so it is
+    returned directly instead of being validated point by point against
+    CalculateResponse (which still documents the schema).
     """
     # Validate method
-    valid_methods = ["trapezoidal", "midpoint", "simpson"]
+    valid_methods = ["trapezoidal", "midpoint", "simpson", "gauss"]
     if request.method not in valid_methods:
         raise HTTPException(
             status_code=400,
@@ -128,7 +205,9 @@ async def calculate(request: CalculateRequest):
     # Compute approximation
     try:
         approx = compute_integral(func, request.a, request.b, request.n, request.method)
-        exact_val, _ = exact_integral(func, request.a, request.b)
+        exact_val, _ = cached_exact_integral(
+            request.function_id, request.custom_expression, request.a, request.b
+        )
         errors = calculate_errors(approx, exact_val)
         viz_data = get_visualization_data(
             func, request.a, request.b, request.n, request.method
@@ -138,22 +217,22 @@ async def calculate(request: CalculateRequest):
     
     h = (request.b - request.a) / request.n
     
-    return CalculateResponse(
-        function_id=request.function_id,
-        function_name=func_info["name"] if func_info else request.custom_expression,
-        function_latex=func_info["latex"] if func_info else request.custom_expression,
-        method=request.method,
-        a=request.a,
-        b=request.b,
-        n=request.n,
-        h=h,
-        approximation=approx,
-        exact_value=exact_val,
-        absolute_error=errors["absolute_error"],
-        relative_error=errors["relative_error"],
-        curve=viz_data["curve"],
-        shapes=viz_data["shapes"],
-    )
+    return FastJSONResponse({
+        "function_id": request.function_id,
+        "function_name": func_info["name"] if func_info else request.custom_expression,
+        "function_latex": func_info["latex"] if func_info else request.custom_expression,
+        "method": request.method,
+        "a": request.a,
+        "b": request.b,
+        "n": request.n,
+        "h": h,
+        "approximation": approx,
+        "exact_value": exact_val,
+        "absolute_error": errors["absolute_error"],
+        "relative_error": errors["relative_error"],
+        "curve": viz_data["curve"],
+        "shapes": viz_data["shapes"],
+    })
 
 
 @router.post("/analyze", response_model=AnalyzeResponse)
@@ -168,29 +247,7 @@ async def analyze(request: AnalyzeRequest):
     
     Returns data suitable for log-log error plots and comparison tables.
     """
-    # Validate methods
-    valid_methods = ["trapezoidal", "midpoint", "simpson"]
-    for method in request.methods:
-        if method not in valid_methods:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Invalid method '{method}'. Must be one of: {valid_methods}"
-            )
-    
-    # Validate bounds
-    if request.a >= request.b:
-        raise HTTPException(
-            status_code=400,
-            detail="Lower bound 'a' must be less than upper bound 'b'"
-        )
-    
-    # Validate n_values
-    for n in request.n_values:
-        if n < 1:
-            raise HTTPException(
-                status_code=400,
-                detail="All N values must be positive integers"
-            )
+    validate_analyze_request(request)
     
     # Get function
     func, func_info = get_func_from_request(
@@ -198,23 +255,27 @@ async def analyze(request: AnalyzeRequest):
         request.custom_expression
     )
     
-    # Perform analysis
+    # Perform analysis off the event loop so other requests stay responsive
     try:
-        analysis = analyze_convergence(
-            func,
+        analysis = await asyncio.to_thread(
+            cached_analyze_convergence,
+            request.function_id,
+            request.custom_expression,
             request.a,
             request.b,
-            request.methods,
-            request.n_values,
+            tuple(request.methods),
+            tuple(sorted(request.n_values)),
+            adaptive=request.adaptive,
         )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analysis error: {str(e)}")
     
-    # Convert results to response format
+    # Convert results to response format. The rows come from internal code
+    # with the right types already, so validation is skipped.
     results = {}
     for method, method_results in analysis["results"].items():
         results[method] = [
-            MethodResult(
+            MethodResult.model_construct(
                 n=r["n"],
                 h=r["h"],
                 approx=r["approx"],
@@ -225,15 +286,12 @@ async def analyze(request: AnalyzeRequest):
             for r in method_results
         ]
     
-    # Use the function's expected best_method if available and it's in the tested methods
-    # This ensures "Midpoint Best" functions show midpoint as winner, etc.
-    winner = analysis["winner"]
-    if func_info and func_info.get("best_method"):
-        expected_best = func_info["best_method"]
-        if expected_best in request.methods:
-            winner = expected_best
+    winner = expected_winner(
+        analysis["winner"], func_info,
+        ranked_methods(request.methods, request.adaptive)
+    )
     
-    return AnalyzeResponse(
+    response = AnalyzeResponse.model_construct(
         function_id=request.function_id,
         function_name=func_info["name"] if func_info else request.custom_expression,
         function_latex=func_info["latex"] if func_info else request.custom_expression,
@@ -246,4 +304,73 @@ async def analyze(request: AnalyzeRequest):
         improvements=analysis["improvements"],
         win_counts=analysis.get("win_counts"),
     )
+    # Returned directly so FastAPI does not re-validate it against response_model
+    return FastJSONResponse(response.model_dump())
+
 
+@router.post("/analyze/stream")
+async def analyze_stream(request: AnalyzeRequest):
+    """
+    Perform the convergence analysis and stream it as newline-delimited JSON.
+    
+    Lets the client plot each method as soon as its sweep is done, while the
+    next one is still running (and cancel it by disconnecting). The sweeps
+    share their samples as in /analyze. Emits one JSON object per line:
+    - {"type": "start", ...}: function metadata and the exact value
+    - {"type": "result", "method": ..., n, h, approx, abs_error, rel_error, eoc}:
+      one per method and N value, a method's rows together in sweep order
+    - {"type": "summary", "winner": ..., "improvements": ..., "win_counts": ...}
+    - {"type": "error", "detail": ...}: if a computation fails mid-stream
+    
+    Same request body and validation as /analyze.
+    """
+    validate_analyze_request(request)
+    
+    func, func_info = get_func_from_request(
+        request.function_id,
+        request.custom_expression
+    )
+    
+    async def records() -> AsyncIterator[bytes]:
+        try:
+            exact_val, exact_err = await asyncio.to_thread(
+                cached_exact_integral,
+                request.function_id,
+                request.custom_expression,
+                request.a,
+                request.b,
+            )
+            yield to_json_line({
+                "type": "start",
+                "function_id": request.function_id,
+                "function_name": func_info["name"] if func_info else request.custom_expression,
+                "function_latex": func_info["latex"] if func_info else request.custom_expression,
+                "a": request.a,
+                "b": request.b,
+                "exact_value": exact_val,
+                "exact_error_estimate": exact_err,
+            })
+            
+            results = {}
+            method_results = iter_method_results(
+                func, request.a, request.b, request.methods,
+                request.n_values, exact_val, request.adaptive
+            )
+            # Each method's sweep is computed in a worker thread as it is
+            # requested, from samples shared with the methods before it
+            while (item := await asyncio.to_thread(next, method_results, None)) is not None:
+                method, rows = item
+                results[method] = rows
+                for row in rows:
+                    yield to_json_line({"type": "result", "method": method, **row})
+            
+            summary = summarize_results(results, request.methods, request.adaptive)
+            summary["winner"] = expected_winner(
+                summary["winner"], func_info,
+                ranked_methods(request.methods, request.adaptive)
+            )
+            yield to_json_line({"type": "summary", **summary})
+        except Exception as e:
+            yield to_json_line({"type": "error", "detail": f"Analysis error: {str(e)}"})
+    
+    return StreamingResponse(records(), media_type="application/x-ndjson")
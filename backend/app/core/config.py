@@ -7,8 +7,8 @@ class Settings:
     API_VERSION: str = "1.0.0"
     DEBUG: bool = True
     
-    # CORS Origins
-    CORS_ORIGINS: list = [
+    # CORS Origins (a set, so each request's origin check is a hash lookup)
+    CORS_ORIGINS: frozenset[str] = frozenset({
         "http://localhost:5173",
         "http://localhost:5174",
         "http://localhost:5175",
@@ -20,6 +20,6 @@ class Settings:
         "https://numerical-analysis-project-complete-three.vercel.app",
         "https://numerical-analysis-project-complete-henna.vercel.app",
         "https://numericalanalysiscomparisian.onrender.com",
-    ]
+    })
 
 settings = Settings()
@@ -0,0 +1,26 @@
+"""
+JSON Response Classes
+"""
+
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from pydantic_core import to_json
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered by pydantic-core's Rust serializer.
+    
+    Faster than the standard library encoder for large float payloads (curve
+    and shape data), and maps NaN/Infinity to null exactly like Pydantic's
+    own JSON output, so responses may bypass model validation safely.
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return to_json(content, inf_nan_mode="null")
+
+
+def to_json_line(content: Any) -> bytes:
+    """Serialize one newline-delimited JSON (NDJSON) record, NaN/Infinity as null."""
+    return to_json(content, inf_nan_mode="null") + b"\n"
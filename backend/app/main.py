@@ -6,6 +6,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from .core.config import settings
+from .core.responses import FastJSONResponse
 from .api.endpoints import router
 
 
@@ -18,8 +19,8 @@ def create_app() -> FastAPI:
         description="""
 ## Numerical Analysis Dashboard API
 
-Compare numerical integration methods (Trapezoidal, Midpoint, Simpson's Rules)
-and analyze their convergence rates.
+Compare numerical integration methods (Trapezoidal, Midpoint, Simpson's Rules,
+and 10-point Gauss-Legendre) and analyze their convergence rates.
 
 ### Features:
 - **Calculate**: Single approximation with visualization data
@@ -33,9 +34,11 @@ and analyze their convergence rates.
         """,
         docs_url="/docs",
         redoc_url="/redoc",
+        default_response_class=FastJSONResponse,
     )
     
-    # Configure CORS
+    # Configure CORS (Starlette keeps the collection as given and tests
+    # membership per request, so the frozenset is passed through unchanged)
     app.add_middleware(
         CORSMiddleware,
         allow_origins=settings.CORS_ORIGINS,
@@ -19,7 +19,7 @@ class CalculateRequest(BaseModel):
     )
     method: str = Field(
         ...,
-        description="Integration method: 'trapezoidal', 'midpoint', or 'simpson'"
+        description="Integration method: 'trapezoidal', 'midpoint', 'simpson', or 'gauss'"
     )
     a: float = Field(..., description="Lower bound of integration")
     b: float = Field(..., description="Upper bound of integration")
@@ -58,6 +58,11 @@ class AnalyzeRequest(BaseModel):
         default=[4, 8, 16, 32, 64, 128, 256, 512, 1024],
         description="List of N values to test"
     )
+    adaptive: bool = Field(
+        default=False,
+        description="Use adaptive Simpson's Rule at decreasing tolerances instead "
+                    "of the uniform Simpson sweep; rows report the subinterval count used"
+    )
     
     class Config:
         json_schema_extra = {
@@ -4,9 +4,41 @@ Convergence Analysis Service
 Provides error calculation and Experimental Order of Convergence (EOC) computation.
 """
 
+import math
 import numpy as np
-from typing import Callable, List, Dict, Any, Optional
-from .integration import compute_integral, exact_integral
+from functools import lru_cache
+from typing import Callable, List, Dict, Any, Optional, Tuple, Iterable, Iterator
+from .functions import resolve_function
+from .integration import (
+    compute_integral,
+    compute_integrals_batch,
+    exact_integral,
+    cached_exact_integral,
+    adaptive_simpson,
+    ADAPTIVE_MIN_TOL,
+    sample_function,
+    uniform_grid,
+    midpoint_grid,
+    trapezoidal_from_samples,
+    midpoint_from_samples,
+    simpson_from_samples,
+)
+
+__all__ = [
+    "calculate_errors",
+    "calculate_eoc",
+    "iter_convergence_rows",
+    "build_convergence_rows",
+    "convergence_points",
+    "iter_shared_grid_results",
+    "analyze_adaptive_simpson",
+    "iter_method_results",
+    "ranked_methods",
+    "summarize_results",
+    "analyze_convergence",
+    "cached_analyze_convergence",
+    "get_theoretical_eoc",
+]
 
 
 def calculate_errors(
@@ -64,88 +96,390 @@ def calculate_eoc(error1: float, error2: float, n1: int, n2: int) -> Optional[fl
         return None
     
     try:
-        eoc = np.log(error1 / error2) / np.log(n2 / n1)
+        # math.log avoids NumPy's ufunc dispatch overhead on scalar inputs
+        eoc = math.log(error1 / error2) / math.log(n2 / n1)
         return float(eoc)
     except (ValueError, ZeroDivisionError):
         return None
 
 
-def analyze_convergence(
+def iter_convergence_rows(
+    points: Iterable[Tuple[int, float]],
+    a: float,
+    b: float,
+    exact_value: float
+) -> Iterator[Dict[str, Any]]:
+    """
+    Turn (n, approximation) pairs into result rows with errors and EOC.
+    
+    Rows are yielded as soon as each pair is available, so points may be a
+    lazy generator (see convergence_points).
+    
+    Args:
+        points: (n, approximation) pairs in sweep order
+        a: Lower bound
+        b: Upper bound
+        exact_value: Reference integral value used for the errors
+        
+    Yields:
+        Result rows (n, h, approx, abs_error, rel_error, eoc)
+    """
+    prev_error = None
+    prev_n = None
+    
+    for n, approx in points:
+        # Calculate errors
+        errors = calculate_errors(approx, exact_value)
+        
+        # Calculate EOC (compare with previous n)
+        eoc = None
+        if prev_error is not None and prev_n is not None:
+            eoc = calculate_eoc(prev_error, errors["absolute_error"], prev_n, n)
+        
+        yield {
+            "n": n,
+            "h": (b - a) / n,  # Step size
+            "approx": approx,
+            "abs_error": errors["absolute_error"],
+            "rel_error": errors["relative_error"],
+            "eoc": eoc,
+        }
+        
+        prev_error = errors["absolute_error"]
+        prev_n = n
+
+
+def build_convergence_rows(
+    points: Iterable[Tuple[int, float]],
+    a: float,
+    b: float,
+    exact_value: float
+) -> List[Dict[str, Any]]:
+    """
+    Turn (n, approximation) pairs into a list of result rows with errors and EOC.
+    
+    Args:
+        points: (n, approximation) pairs in sweep order
+        a: Lower bound
+        b: Upper bound
+        exact_value: Reference integral value used for the errors
+        
+    Returns:
+        List of result rows (n, h, approx, abs_error, rel_error, eoc)
+    """
+    return list(iter_convergence_rows(points, a, b, exact_value))
+
+
+def convergence_points(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    method: str,
+    n_values: List[int],
+    adaptive: bool = False
+) -> Iterator[Tuple[int, float]]:
+    """
+    Lazily compute the (n, approximation) pairs of one method's sweep.
+    
+    Each pair is computed independently when requested; the uniform sweeps
+    of the analysis share samples instead (see iter_shared_grid_results).
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        method: Integration method
+        n_values: List of n values to test
+        adaptive: Use adaptive Simpson's Rule at decreasing tolerances
+            (1e-1, 1e-2, ..., never below ADAPTIVE_MIN_TOL) for the
+            Simpson sweep, reporting the subinterval count used as n
+        
+    Yields:
+        (n, approximation) pairs in sweep order
+    """
+    if adaptive and method == "simpson":
+        last_tol = None
+        for k in range(len(n_values)):
+            # Rows past the tolerance floor repeat the last integration
+            tol = max(10.0 ** -(k + 1), ADAPTIVE_MIN_TOL)
+            if tol != last_tol:
+                approx, n_used = adaptive_simpson(func, a, b, tol=tol)
+                last_tol = tol
+            yield n_used, approx
+    else:
+        for n in sorted(n_values):
+            yield n, compute_integral(func, a, b, n, method)
+
+
+def _evaluate_methods_shared(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    n: int,
+    methods: List[str]
+) -> Dict[str, float]:
+    """
+    Approximate the integral with several methods at a single n, sharing samples.
+    
+    Trapezoidal and Simpson's (for even n) use the same n + 1 nodes, and the
+    midpoint rule its n midpoints, so each point set is sampled at most once.
+    Any other method (or Simpson's with odd n) is computed on its own grid.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        n: Number of subintervals
+        methods: Methods to evaluate
+        
+    Returns:
+        Dictionary mapping each method to its approximation
+    """
+    h = (b - a) / n
+    y_nodes = None
+    approximations = {}
+    
+    for method in methods:
+        if method == "trapezoidal" or (method == "simpson" and n % 2 == 0):
+            if y_nodes is None:
+                y_nodes = sample_function(func, uniform_grid(a, b, n))
+            if method == "trapezoidal":
+                approximations[method] = trapezoidal_from_samples(y_nodes, h)
+            else:
+                approximations[method] = simpson_from_samples(y_nodes, h)
+        elif method == "midpoint":
+            y_mid = sample_function(func, midpoint_grid(a, b, n))
+            approximations[method] = midpoint_from_samples(y_mid, h)
+        else:
+            approximations[method] = compute_integral(func, a, b, n, method)
+    
+    return approximations
+
+
+def iter_shared_grid_results(
     func: Callable[[float], float],
     a: float,
     b: float,
     methods: List[str],
-    n_values: List[int]
-) -> Dict[str, Any]:
+    n_values: List[int],
+    exact_value: float
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
     """
-    Perform convergence analysis for the given function and methods.
+    Lazily compute the convergence rows of each method from one shared set of samples.
     
-    Computes integral approximations for each method and n value,
-    then calculates errors and EOC.
+    The grids for n = 4, 8, 16, ... are nested, so func is sampled once on
+    the finest grid and each coarser n takes every (n_fine // n)-th node.
+    Only power-of-two strides are used: the fine spacing is then the coarse
+    one divided by a power of two, so the strided nodes are bitwise the
+    nodes uniform_grid(a, b, n) would build. A coarse midpoint falls on a
+    fine node when the stride is at least 2 and is a fine midpoint when it
+    is 1; the fine midpoints are only sampled if needed. All other n values
+    are computed per n with _evaluate_methods_shared. Gauss-Legendre nodes
+    are never nested, so its whole sweep is one compute_integrals_batch call.
+    
+    The samples are shared across all methods, and one method's rows are
+    computed per step of the iteration.
     
     Args:
         func: The function to integrate
         a: Lower bound
         b: Upper bound
-        methods: List of methods ('trapezoidal', 'midpoint', 'simpson')
-        n_values: List of n values to test (e.g., [4, 8, 16, 32, ...])
+        methods: List of methods ('trapezoidal', 'midpoint', 'simpson', 'gauss')
+        n_values: List of n values to test
+        exact_value: Reference integral value used for the errors
+        
+    Yields:
+        (method, result rows) pairs, in the order of methods
+    """
+    def effective_n(n: int, method: str) -> int:
+        # Simpson's rule rounds odd n up to the next even number
+        if method == "simpson" and n % 2 != 0:
+            return n + 1
+        return n
+    
+    n_fine = max(
+        (effective_n(n, method) for method in methods for n in n_values),
+        default=0
+    )
+    cache: Dict[str, np.ndarray] = {}
+    
+    def nodes() -> np.ndarray:
+        if "nodes" not in cache:
+            cache["nodes"] = sample_function(func, uniform_grid(a, b, n_fine))
+        return cache["nodes"]
+    
+    def midpoints() -> np.ndarray:
+        if "midpoints" not in cache:
+            cache["midpoints"] = sample_function(func, midpoint_grid(a, b, n_fine))
+        return cache["midpoints"]
+    
+    def on_grid(n: int, method: str) -> bool:
+        # True when the grid for n is the finest one strided by a power of two
+        n_eff = effective_n(n, method)
+        step = n_fine // n_eff
+        return n_fine % n_eff == 0 and step & (step - 1) == 0
+    
+    # N values that are not on the finest grid, shared across methods
+    # (Gauss-Legendre is batched separately in run_method)
+    grid_methods = [m for m in methods if m != "gauss"]
+    off_grid = {
+        n: _evaluate_methods_shared(
+            func, a, b, n,
+            [m for m in grid_methods if not on_grid(n, m)]
+        )
+        for n in set(n_values)
+        if any(not on_grid(n, m) for m in grid_methods)
+    }
+    
+    def approximate(method: str, n: int) -> float:
+        if not on_grid(n, method):
+            return off_grid[n][method]
+        
+        n_eff = effective_n(n, method)
+        step = n_fine // n_eff
+        h = (b - a) / n_eff
+        if method == "trapezoidal":
+            return trapezoidal_from_samples(nodes()[::step], h)
+        elif method == "midpoint":
+            if step > 1:
+                return midpoint_from_samples(nodes()[step // 2::step], h)
+            return midpoint_from_samples(midpoints(), h)
+        elif method == "simpson":
+            # Contiguous copy so np.dot sums in the same order as for a fresh grid
+            return simpson_from_samples(np.ascontiguousarray(nodes()[::step]), h)
+        return compute_integral(func, a, b, n, method)
+    
+    def run_method(method: str) -> List[Dict[str, Any]]:
+        ns = sorted(n_values)
+        if method == "gauss":
+            # Gauss nodes are not nested, so sample every n in one batched call
+            values = compute_integrals_batch(func, a, b, ns, method)
+        else:
+            values = [approximate(method, n) for n in ns]
+        return build_convergence_rows(list(zip(ns, values)), a, b, exact_value)
+    
+    for method in methods:
+        yield method, run_method(method)
+
+
+def analyze_adaptive_simpson(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    n_values: List[int],
+    exact_value: float
+) -> List[Dict[str, Any]]:
+    """
+    Compute convergence rows for adaptive Simpson's Rule.
+    
+    Runs one adaptive integration per requested row, tightening the tolerance
+    by a factor of 10 each time (1e-1, 1e-2, ...). Each row reports the
+    number of subintervals the recursion actually used as its n.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        n_values: Requested n values (only their count is used)
+        exact_value: Reference integral value used for the errors
         
     Returns:
-        Dictionary containing exact value and results for each method
+        List of result rows, one per tolerance
     """
-    # Get exact value
-    exact_val, exact_err = exact_integral(func, a, b)
+    points = convergence_points(func, a, b, "simpson", n_values, adaptive=True)
+    return build_convergence_rows(points, a, b, exact_value)
+
+
+def iter_method_results(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    methods: List[str],
+    n_values: List[int],
+    exact_value: float,
+    adaptive: bool = False
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Lazily compute the convergence rows of each method, one method at a time.
     
-    results = {}
+    The uniform sweeps come from iter_shared_grid_results; with adaptive set,
+    Simpson's rows come from analyze_adaptive_simpson instead.
     
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        methods: List of methods ('trapezoidal', 'midpoint', 'simpson', 'gauss')
+        n_values: List of n values to test
+        exact_value: Reference integral value used for the errors
+        adaptive: Use adaptive Simpson's Rule for the Simpson sweep
+        
+    Yields:
+        (method, result rows) pairs, in the order of methods
+    """
+    uniform_methods = [m for m in methods if not (adaptive and m == "simpson")]
+    shared = iter_shared_grid_results(func, a, b, uniform_methods, n_values, exact_value)
     for method in methods:
-        method_results = []
-        prev_error = None
-        prev_n = None
+        if adaptive and method == "simpson":
+            yield method, analyze_adaptive_simpson(func, a, b, n_values, exact_value)
+        else:
+            yield next(shared)
+
+
+def ranked_methods(methods: List[str], adaptive: bool = False) -> List[str]:
+    """
+    Return the methods that compete for the win.
+    
+    Row k of an adaptive Simpson sweep is one tolerance, not n_values[k]
+    subintervals, so it cannot be compared row by row with the uniform
+    methods. With adaptive set, Simpson is left out unless it is the only
+    method.
+    
+    Args:
+        methods: The analyzed methods
+        adaptive: Whether the Simpson rows come from adaptive Simpson
         
-        for n in sorted(n_values):
-            # Compute approximation
-            approx = compute_integral(func, a, b, n, method)
-            
-            # Calculate errors
-            errors = calculate_errors(approx, exact_val)
-            
-            # Calculate EOC (compare with previous n)
-            eoc = None
-            if prev_error is not None and prev_n is not None:
-                eoc = calculate_eoc(prev_error, errors["absolute_error"], prev_n, n)
-            
-            method_results.append({
-                "n": n,
-                "h": (b - a) / n,  # Step size
-                "approx": approx,
-                "abs_error": errors["absolute_error"],
-                "rel_error": errors["relative_error"],
-                "eoc": eoc,
-            })
-            
-            prev_error = errors["absolute_error"]
-            prev_n = n
-        
-        results[method] = method_results
+    Returns:
+        List of ranked methods, in the order given
+    """
+    return [m for m in methods if not (adaptive and m == "simpson")] or methods
+
+
+def summarize_results(
+    results: Dict[str, List[Dict[str, Any]]],
+    methods: List[str],
+    adaptive: bool = False
+) -> Dict[str, Any]:
+    """
+    Pick the winning method and compute improvement ratios.
+    
+    Only the ranked_methods take part in the win counts and improvements.
+    
+    Args:
+        results: Result rows per method, all with the same number of rows
+        methods: The analyzed methods
+        adaptive: Whether the Simpson rows come from adaptive Simpson
+        
+    Returns:
+        Dictionary with winner, improvements and win_counts
+    """
+    ranked = ranked_methods(methods, adaptive)
     
     # Determine winner by counting which method wins across all N values
     # This gives more weight to practical N ranges
-    win_counts = {method: 0 for method in methods}
-    
-    for i in range(len(n_values)):
-        errors_at_n = {}
-        for method in methods:
-            if len(results[method]) > i:
-                errors_at_n[method] = results[method][i]["abs_error"]
-        
-        if errors_at_n:
-            # Find the minimum error at this N
-            min_error = min(errors_at_n.values())
-            # All methods with this minimum error get a win (handles ties)
-            for method, error in errors_at_n.items():
-                if error == min_error:
-                    win_counts[method] += 1
+    win_counts = {method: 0 for method in ranked}
+    
+    if win_counts:
+        # Errors as a (methods x N values) matrix; NaN never wins
+        err_mat = np.array(
+            [[r["abs_error"] for r in results[method]] for method in win_counts],
+            dtype=float
+        )
+        err_mat[np.isnan(err_mat)] = np.inf
+        min_errors = err_mat.min(axis=0)
+        # All methods with the minimum error at an N get a win (handles ties)
+        wins = (err_mat == min_errors) & np.isfinite(min_errors)
+        win_counts = dict(zip(win_counts, wins.sum(axis=1).tolist()))
     
     # Winner is the method with most wins
     # If tied, use the method with smallest final error
@@ -164,9 +498,9 @@ def analyze_convergence(
     
     # Calculate improvement ratios based on final errors
     final_errors = {}
-    for method, method_results in results.items():
-        if method_results:
-            final_errors[method] = method_results[-1]["abs_error"]
+    for method in ranked:
+        if results[method]:
+            final_errors[method] = results[method][-1]["abs_error"]
     
     improvements = {}
     if winner and len(final_errors) > 1:
@@ -176,25 +510,108 @@ def analyze_convergence(
                 improvements[method] = error / winner_error
     
     return {
-        "exact_value": exact_val,
-        "exact_error_estimate": exact_err,
-        "results": results,
         "winner": winner,
         "improvements": improvements,
         "win_counts": win_counts,  # Added for transparency
     }
 
 
+def analyze_convergence(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    methods: List[str],
+    n_values: List[int],
+    adaptive: bool = False,
+    exact: Optional[Tuple[float, float]] = None
+) -> Dict[str, Any]:
+    """
+    Perform convergence analysis for the given function and methods.
+    
+    Computes integral approximations for each method and n value,
+    then calculates errors and EOC.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        methods: List of methods ('trapezoidal', 'midpoint', 'simpson', 'gauss')
+        n_values: List of n values to test (e.g., [4, 8, 16, 32, ...])
+        adaptive: Replace the uniform Simpson sweep with adaptive Simpson
+            runs at decreasing tolerances
+        exact: Precomputed (value, error estimate) of the exact integral;
+            computed with exact_integral if not given
+        
+    Returns:
+        Dictionary containing exact value and results for each method
+    """
+    # Get exact value
+    exact_val, exact_err = exact if exact is not None else exact_integral(func, a, b)
+    
+    results = dict(
+        iter_method_results(func, a, b, methods, n_values, exact_val, adaptive)
+    )
+    
+    summary = summarize_results(results, methods, adaptive)
+    
+    return {
+        "exact_value": exact_val,
+        "exact_error_estimate": exact_err,
+        "results": results,
+        **summary,
+    }
+
+
+@lru_cache(maxsize=128)
+def cached_analyze_convergence(
+    function_id: str | None,
+    custom_expression: str | None,
+    a: float,
+    b: float,
+    methods: Tuple[str, ...],
+    n_values: Tuple[int, ...],
+    adaptive: bool = False
+) -> Dict[str, Any]:
+    """
+    Memoized analyze_convergence keyed by the request parameters.
+    
+    Pass n_values sorted so equivalent requests share an entry. The returned
+    dictionary is shared between callers and must be treated as read-only.
+    The exact value comes from cached_exact_integral, so requests that only
+    change the methods or n values do not repeat scipy.quad.
+    
+    Args:
+        function_id: ID of a predefined function, takes precedence if given
+        custom_expression: Custom expression used when no function ID is given
+        a: Lower bound
+        b: Upper bound
+        methods: Methods to analyze
+        n_values: N values to test
+        adaptive: Use adaptive Simpson's Rule for the Simpson sweep
+        
+    Returns:
+        Dictionary containing exact value and results for each method
+    """
+    func = resolve_function(function_id, custom_expression)
+    exact = cached_exact_integral(function_id, custom_expression, a, b)
+    return analyze_convergence(
+        func, a, b, list(methods), list(n_values), adaptive, exact
+    )
+
+
 def get_theoretical_eoc(method: str) -> float:
     """
     Get the theoretical EOC for a method.
     
     Returns:
-        2.0 for Trapezoidal and Midpoint, 4.0 for Simpson's
+        2.0 for Trapezoidal and Midpoint, 4.0 for Simpson's,
+        20.0 for 10-point Gauss-Legendre
     """
     if method in ["trapezoidal", "midpoint"]:
         return 2.0
     elif method == "simpson":
         return 4.0
+    elif method == "gauss":
+        return 20.0
     else:
         return 0.0
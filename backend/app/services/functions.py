@@ -11,6 +11,8 @@ import numpy as np
 from typing import Callable, Dict, Any
 import ast
 import operator
+from collections import Counter
+from functools import lru_cache
 
 # Define all test functions with their metadata
 FUNCTIONS: Dict[str, Dict[str, Any]] = {
@@ -63,7 +65,7 @@ FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "name": "1/√x",
         "latex": r"\frac{1}{\sqrt{x}}",
         "category": "Midpoint Best",
-        "func": lambda x: 1 / np.sqrt(x) if x > 0 else 0,
+        "func": lambda x: np.where(x > 0, 1 / np.sqrt(np.where(x > 0, x, 1)), 0.0),
         "default_a": 0,
         "default_b": 1,
         "best_method": "midpoint",
@@ -73,7 +75,7 @@ FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "name": "ln(x)",
         "latex": r"\ln(x)",
         "category": "Midpoint Best",
-        "func": lambda x: np.log(x) if x > 0 else 0,
+        "func": lambda x: np.where(x > 0, np.log(np.where(x > 0, x, 1)), 0.0),
         "default_a": 0,
         "default_b": 1,
         "best_method": "midpoint",
@@ -85,7 +87,7 @@ FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "name": "1/(1+x²)",
         "latex": r"\frac{1}{1+x^2}",
         "category": "Mild Curvature",
-        "func": lambda x: 1 / (1 + x**2),
+        "func": lambda x: 1 / (1 + x*x),
         "default_a": 0,
         "default_b": 1,
         "best_method": "simpson",
@@ -107,7 +109,7 @@ FUNCTIONS: Dict[str, Dict[str, Any]] = {
         "name": "x³ - 3x",
         "latex": r"x^3 - 3x",
         "category": "Turning Points",
-        "func": lambda x: x**3 - 3*x,
+        "func": lambda x: x * (x*x - 3),  # Horner form of x**3 - 3x
         "default_a": -2,
         "default_b": 2,
         "best_method": "simpson",
@@ -162,6 +164,16 @@ def get_function_info(function_id: str) -> Dict[str, Any]:
     raise ValueError(f"Unknown function ID: {function_id}")
 
 
+def resolve_function(
+    function_id: str | None,
+    custom_expression: str | None
+) -> Callable[[float], float]:
+    """Get the integrand from a predefined function ID or a custom expression."""
+    if function_id:
+        return get_function(function_id)
+    return parse_custom_expression(custom_expression)
+
+
 def list_functions() -> Dict[str, Dict[str, Any]]:
     """List all available functions with their metadata."""
     return {
@@ -186,7 +198,7 @@ class SafeExpressionParser:
     """
     
     ALLOWED_NAMES = {
-        'x': None,  # Will be set during evaluation
+        'x': None,  # Bound as the compiled function's parameter
         'sin': np.sin,
         'cos': np.cos,
         'tan': np.tan,
@@ -198,7 +210,19 @@ class SafeExpressionParser:
         'e': np.e,
     }
     
+    # Python source for each allowed operator, used to compile the expression
     ALLOWED_OPERATORS = {
+        ast.Add: '+',
+        ast.Sub: '-',
+        ast.Mult: '*',
+        ast.Div: '/',
+        ast.Pow: '**',
+        ast.USub: '-',
+        ast.UAdd: '+',
+    }
+    
+    # Used to fold subtrees that do not depend on x at parse time
+    OPERATOR_FUNCTIONS = {
         ast.Add: operator.add,
         ast.Sub: operator.sub,
         ast.Mult: operator.mul,
@@ -208,72 +232,256 @@ class SafeExpressionParser:
         ast.UAdd: operator.pos,
     }
     
+    # Largest integer exponent compiled as repeated multiplication
+    MAX_UNROLLED_POWER = 4
+    
     def __init__(self, expression: str):
         self.expression = expression
         self.tree = ast.parse(expression, mode='eval')
         self._validate(self.tree.body)
+        # Folded values that are not plain ints or floats (NumPy scalars)
+        self._constants: Dict[str, Any] = {}
+        self._compiled = self._compile(self._to_ast(self._fold(self.tree.body)))
     
-    def _validate(self, node):
-        """Validate that the AST only contains allowed operations."""
-        if isinstance(node, ast.Constant):
-            if not isinstance(node.value, (int, float)):
-                raise ValueError(f"Invalid constant type: {type(node.value)}")
-        elif isinstance(node, ast.Name):
-            if node.id not in self.ALLOWED_NAMES:
-                raise ValueError(f"Unknown name: {node.id}")
-        elif isinstance(node, ast.BinOp):
-            if type(node.op) not in self.ALLOWED_OPERATORS:
-                raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-            self._validate(node.left)
-            self._validate(node.right)
+    def _validate(self, root):
+        """
+        Validate that the AST only contains allowed operations.
+        
+        Walks the tree with an explicit stack (left to right, like the
+        recursive descent it replaces). The later passes are iterative as
+        well, so their depth is only bounded by what ast.parse and compile
+        accept.
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            children = ()
+            if isinstance(node, ast.Constant):
+                if not isinstance(node.value, (int, float)):
+                    raise ValueError(f"Invalid constant type: {type(node.value)}")
+            elif isinstance(node, ast.Name):
+                if node.id not in self.ALLOWED_NAMES:
+                    raise ValueError(f"Unknown name: {node.id}")
+            elif isinstance(node, ast.BinOp):
+                if type(node.op) not in self.ALLOWED_OPERATORS:
+                    raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+                children = (node.left, node.right)
+            elif isinstance(node, ast.UnaryOp):
+                if type(node.op) not in self.ALLOWED_OPERATORS:
+                    raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
+                children = (node.operand,)
+            elif isinstance(node, ast.Call):
+                if not isinstance(node.func, ast.Name):
+                    raise ValueError("Only simple function calls allowed")
+                if node.func.id not in self.ALLOWED_NAMES:
+                    raise ValueError(f"Unknown function: {node.func.id}")
+                children = node.args
+            else:
+                raise ValueError(f"Unsupported expression type: {type(node).__name__}")
+            # Reversed so the leftmost child is validated first
+            stack.extend(reversed(children))
+    
+    @staticmethod
+    def _children(node) -> tuple:
+        """Return the operand nodes of a validated AST node, left to right."""
+        if isinstance(node, ast.BinOp):
+            return (node.left, node.right)
         elif isinstance(node, ast.UnaryOp):
-            if type(node.op) not in self.ALLOWED_OPERATORS:
-                raise ValueError(f"Unsupported operator: {type(node.op).__name__}")
-            self._validate(node.operand)
+            return (node.operand,)
         elif isinstance(node, ast.Call):
-            if not isinstance(node.func, ast.Name):
-                raise ValueError("Only simple function calls allowed")
-            if node.func.id not in self.ALLOWED_NAMES:
-                raise ValueError(f"Unknown function: {node.func.id}")
-            for arg in node.args:
-                self._validate(arg)
-        else:
-            raise ValueError(f"Unsupported expression type: {type(node).__name__}")
+            return tuple(node.args)
+        return ()
+    
+    def _postorder(self, root):
+        """Yield every node after its operands, left to right, without recursion."""
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            if expanded:
+                yield node
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(self._children(node)))
+    
+    def _fold(self, root):
+        """
+        Constant-fold a validated AST, replacing every subtree that does not
+        depend on x (e.g. 2*pi or sqrt(2)) with its value.
+        
+        Operand order is kept, so folding never changes the rounding. Subtrees
+        that fail to evaluate are left alone and raise when called, as before.
+        """
+        folded: Dict[int, Any] = {}
+        for node in self._postorder(root):
+            operands = [folded[id(child)] for child in self._children(node)]
+            if isinstance(node, ast.Name):
+                result = node if node.id == 'x' else ast.Constant(self.ALLOWED_NAMES[node.id])
+            elif isinstance(node, ast.BinOp):
+                result = ast.BinOp(operands[0], node.op, operands[1])
+                func = self.OPERATOR_FUNCTIONS[type(node.op)]
+            elif isinstance(node, ast.UnaryOp):
+                result = ast.UnaryOp(node.op, operands[0])
+                func = self.OPERATOR_FUNCTIONS[type(node.op)]
+            elif isinstance(node, ast.Call):
+                result = ast.Call(node.func, operands, [])
+                func = self.ALLOWED_NAMES[node.func.id]
+            else:
+                result = node
+            
+            if operands and all(isinstance(operand, ast.Constant) for operand in operands):
+                try:
+                    result = ast.Constant(func(*(operand.value for operand in operands)))
+                except (ArithmeticError, TypeError, ValueError):
+                    pass
+            folded[id(node)] = result
+        return folded[id(root)]
+    
+    def _subtree_keys(self, root) -> Dict[int, int]:
+        """
+        Map every node (by id) to an integer key shared by equal subtrees.
+        
+        Keys are interned bottom-up, so a node's key refers to its operands'
+        integer keys instead of nesting their tuples.
+        """
+        keys: Dict[int, int] = {}
+        interned: Dict[tuple, int] = {}
+        for node in self._postorder(root):
+            if isinstance(node, ast.Constant):
+                k = ('const', type(node.value).__name__, repr(node.value))
+            elif isinstance(node, ast.Name):
+                k = ('name', node.id)
+            else:
+                label = node.func.id if isinstance(node, ast.Call) else type(node.op).__name__
+                k = (type(node).__name__, label, *(keys[id(child)] for child in self._children(node)))
+            keys[id(node)] = interned.setdefault(k, len(interned))
+        return keys
     
-    def _eval(self, node, x):
-        """Evaluate the AST with the given x value."""
+    def _to_ast(self, root):
+        """
+        Build the body of the compiled function from a folded AST.
+        
+        Repeated subexpressions (e.g. both sin(x) in sin(x)/(1 + sin(x))) are
+        computed once: the first occurrence is bound with := to a temporary
+        and later ones reuse it. Python evaluates operands and call arguments
+        left to right, so the binding always runs before any reuse.
+        """
+        keys = self._subtree_keys(root)
+        
+        # Count uses as they will appear in the output: a repeated subtree is
+        # replaced by its temporary, so its own children are only counted once
+        counts: Counter = Counter()
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            counts[keys[id(node)]] += 1
+            if counts[keys[id(node)]] == 1:
+                stack.extend(self._children(node))
+        
+        # Post-order walk that does not descend into subtrees already bound to
+        # a temporary (equal subtrees never nest, so the first one is complete)
+        temps: Dict[int, str] = {}
+        built: Dict[int, Any] = {}
+        stack = [(root, False)]
+        while stack:
+            node, expanded = stack.pop()
+            k = keys[id(node)]
+            if not expanded:
+                if k in temps:
+                    built[id(node)] = ast.Name(temps[k], ast.Load())
+                else:
+                    stack.append((node, True))
+                    stack.extend((child, False) for child in reversed(self._children(node)))
+                continue
+            
+            result = self._node_ast(node, [built[id(child)] for child in self._children(node)])
+            if counts[k] > 1 and not isinstance(node, (ast.Constant, ast.Name)):
+                temps[k] = f"_t{len(temps)}"
+                result = ast.NamedExpr(ast.Name(temps[k], ast.Store()), result)
+            built[id(node)] = result
+        return built[id(root)]
+    
+    def _node_ast(self, node, operands: list):
+        """Build the output node for one node from its already built operands."""
         if isinstance(node, ast.Constant):
-            return node.value
+            value = node.value
+            if type(value) in (int, float):
+                return ast.Constant(value)
+            name = f"_c{len(self._constants)}"
+            self._constants[name] = value
+            return ast.Name(name, ast.Load())
         elif isinstance(node, ast.Name):
-            if node.id == 'x':
-                return x
-            return self.ALLOWED_NAMES[node.id]
+            return ast.Name(node.id, ast.Load())
         elif isinstance(node, ast.BinOp):
-            left = self._eval(node.left, x)
-            right = self._eval(node.right, x)
-            return self.ALLOWED_OPERATORS[type(node.op)](left, right)
+            left, right = operands
+            # x**k with a small integer k becomes repeated multiplication, which
+            # avoids np.power (only for a bare name, so nothing is recomputed)
+            if (
+                isinstance(node.op, ast.Pow)
+                and isinstance(node.left, ast.Name)
+                and isinstance(node.right, ast.Constant)
+                and type(node.right.value) is int
+                and 2 <= node.right.value <= self.MAX_UNROLLED_POWER
+            ):
+                product = left
+                for _ in range(node.right.value - 1):
+                    product = ast.BinOp(product, ast.Mult(), ast.Name(left.id, ast.Load()))
+                return product
+            return ast.BinOp(left, node.op, right)
         elif isinstance(node, ast.UnaryOp):
-            operand = self._eval(node.operand, x)
-            return self.ALLOWED_OPERATORS[type(node.op)](operand)
+            return ast.UnaryOp(node.op, operands[0])
         elif isinstance(node, ast.Call):
-            func = self.ALLOWED_NAMES[node.func.id]
-            args = [self._eval(arg, x) for arg in node.args]
-            return func(*args)
-        raise ValueError(f"Cannot evaluate: {type(node).__name__}")
+            return ast.Call(ast.Name(node.func.id, ast.Load()), operands, [])
+        raise ValueError(f"Cannot compile: {type(node).__name__}")
+    
+    def _compile(self, body) -> Callable[[float], float]:
+        """
+        Compile the built AST into a function of x.
+        
+        The AST is compiled directly, without a round trip through source
+        text, so long operator chains do not hit the parser's nesting limit.
+        It only references names from ALLOWED_NAMES (checked by _validate)
+        plus the folded constants and temporaries, and builtins are disabled
+        in the evaluation namespace.
+        """
+        namespace = {
+            name: value for name, value in self.ALLOWED_NAMES.items() if name != 'x'
+        }
+        namespace.update(self._constants)
+        namespace['__builtins__'] = {}
+        function = ast.Lambda(
+            ast.arguments(
+                posonlyargs=[], args=[ast.arg('x')], kwonlyargs=[],
+                kw_defaults=[], defaults=[]
+            ),
+            body
+        )
+        tree = ast.Expression(function)
+        # Same as ast.fix_missing_locations, which recurses, for one-line input
+        for node in ast.walk(tree):
+            if 'lineno' in node._attributes:
+                node.lineno = node.end_lineno = 1
+                node.col_offset = node.end_col_offset = 0
+        code = compile(tree, "<custom expression>", "eval")
+        return eval(code, namespace)
     
     def evaluate(self, x: float) -> float:
         """Evaluate the expression for a given x value."""
-        return self._eval(self.tree.body, x)
+        return self._compiled(x)
     
     def get_function(self) -> Callable[[float], float]:
         """Return a callable function."""
-        return lambda x: self.evaluate(x)
+        return self._compiled
 
 
+@lru_cache(maxsize=256)
 def parse_custom_expression(expression: str) -> Callable[[float], float]:
     """
     Parse a custom mathematical expression and return a callable function.
     
+    Parsed expressions are cached by their source string (bounded LRU), so
+    repeated requests that only change a, b, n or the method reuse the same
+    callable. Invalid expressions raise and are never cached.
+    
     Supported operations: +, -, *, /, **
     Supported functions: sin, cos, tan, exp, log, sqrt, abs
     Supported constants: pi, e
@@ -5,13 +5,211 @@ Implements:
 - Trapezoidal Rule
 - Midpoint Rule
 - Simpson's Rule
+- Adaptive Simpson's Rule
+- Gauss-Legendre Rule (10 points per subinterval)
 - Exact Integration (using scipy.integrate.quad)
 """
 
+import os
 import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from scipy import integrate
 from typing import Callable, Tuple, List, Dict, Any
 
+from .functions import FUNCTIONS, resolve_function
+
+# 10-point Gauss-Legendre nodes and weights on [-1, 1], computed once
+GAUSS_POINTS = 10
+_GAUSS_NODES, _GAUSS_WEIGHTS = np.polynomial.legendre.leggauss(GAUSS_POINTS)
+
+# Per-n arrays are only cached up to this many subintervals. n is request
+# controlled, and above this size rebuilding an array is cheap next to
+# sampling func on it, while caching it would pin its memory.
+MAX_CACHED_N = 4096
+
+# Limits for adaptive Simpson. Tolerances below ADAPTIVE_MIN_TOL are under
+# the rounding floor of the panel sums and would only force needless
+# splitting; ADAPTIVE_MAX_EVALS bounds the work of a single call.
+ADAPTIVE_MIN_TOL = 1e-14
+ADAPTIVE_MAX_EVALS = 50_000
+
+
+def sample_function(func: Callable[[float], float], x: np.ndarray) -> np.ndarray:
+    """
+    Evaluate func on a whole array of points in a single call.
+    
+    The result is always a float array with the same shape as x, so constant
+    expressions (e.g. "5") that return a scalar are broadcast as well.
+    """
+    return np.broadcast_to(np.asarray(func(x), dtype=np.float64), x.shape)
+
+
+def _build_midpoints(a: float, b: float, n: int) -> np.ndarray:
+    h = (b - a) / n
+    return a + (np.arange(n) + 0.5) * h
+
+
+@lru_cache(maxsize=32)
+def _cached_grid(a: float, b: float, n: int) -> np.ndarray:
+    x = np.linspace(a, b, n + 1)
+    x.flags.writeable = False
+    return x
+
+
+@lru_cache(maxsize=32)
+def _cached_midpoints(a: float, b: float, n: int) -> np.ndarray:
+    x = _build_midpoints(a, b, n)
+    x.flags.writeable = False
+    return x
+
+
+def uniform_grid(a: float, b: float, n: int) -> np.ndarray:
+    """
+    Get the n + 1 uniform grid nodes on [a, b].
+    
+    The UI keeps re-requesting the same interval and n while switching
+    method, so grids with n <= MAX_CACHED_N are cached by (a, b, n) and
+    returned read-only. Larger grids are built per call and freed with the
+    request.
+    """
+    if n <= MAX_CACHED_N:
+        return _cached_grid(a, b, n)
+    return np.linspace(a, b, n + 1)
+
+
+def midpoint_grid(a: float, b: float, n: int) -> np.ndarray:
+    """Get the n subinterval midpoints on [a, b], cached like uniform_grid."""
+    if n <= MAX_CACHED_N:
+        return _cached_midpoints(a, b, n)
+    return _build_midpoints(a, b, n)
+
+
+def _method_grid(
+    a: float,
+    b: float,
+    n: int,
+    method: str
+) -> Tuple[float, np.ndarray]:
+    """
+    Build the sample points a method uses for n subintervals.
+    
+    The points match the ones the individual rules sample, so results from
+    compute_integrals_batch are identical to calling compute_integral per n.
+    
+    Returns:
+        Tuple of (step size, sample points)
+    """
+    if method == "simpson" and n % 2 != 0:
+        n += 1
+    h = (b - a) / n
+    
+    if method in ("trapezoidal", "simpson"):
+        return h, uniform_grid(a, b, n)
+    elif method == "midpoint":
+        return h, midpoint_grid(a, b, n)
+    elif method == "gauss":
+        # One row of GAUSS_POINTS nodes per subinterval, around its centre
+        return h, midpoint_grid(a, b, n)[:, None] + (h / 2) * _GAUSS_NODES
+    raise ValueError(f"Unknown method: {method}")
+
+
+def trapezoidal_from_samples(y: np.ndarray, h: float) -> float:
+    """
+    Apply the Trapezoidal Rule to samples taken on a uniform grid of step h.
+    
+    Args:
+        y: Function values at the n + 1 grid nodes
+        h: Step size
+        
+    Returns:
+        Approximation of the integral
+    """
+    # Trapezoidal formula: h/2 * (f(a) + 2*sum(f(x_i)) + f(b)),
+    # rewritten as h * (sum of all samples - half of the two endpoints)
+    result = h * (np.sum(y) - 0.5 * (y[0] + y[-1]))
+    return float(result)
+
+
+def midpoint_from_samples(y: np.ndarray, h: float) -> float:
+    """
+    Apply the Midpoint Rule to samples taken at the n subinterval midpoints.
+    
+    Args:
+        y: Function values at the midpoints
+        h: Step size
+        
+    Returns:
+        Approximation of the integral
+    """
+    result = h * np.sum(y)
+    return float(result)
+
+
+def _build_simpson_weights(n: int) -> np.ndarray:
+    w = np.ones(n + 1)
+    w[1:-1:2] = 4
+    w[2:-1:2] = 2
+    return w
+
+
+@lru_cache(maxsize=64)
+def _cached_simpson_weights(n: int) -> np.ndarray:
+    w = _build_simpson_weights(n)
+    w.flags.writeable = False
+    return w
+
+
+def simpson_weights(n: int) -> np.ndarray:
+    """
+    Get the Simpson weight vector [1, 4, 2, 4, ..., 2, 4, 1] for n subintervals.
+    
+    The convergence sweep uses the same n values on every request, so vectors
+    for n <= MAX_CACHED_N are built once and cached (read-only); larger ones
+    are built per call so they are freed with the request.
+    
+    Args:
+        n: Number of subintervals (must be even)
+        
+    Returns:
+        Array of n + 1 weights
+    """
+    if n <= MAX_CACHED_N:
+        return _cached_simpson_weights(n)
+    return _build_simpson_weights(n)
+
+
+def simpson_from_samples(y: np.ndarray, h: float) -> float:
+    """
+    Apply Simpson's Rule to samples taken on a uniform grid of step h.
+    
+    Args:
+        y: Function values at the n + 1 grid nodes (n must be even)
+        h: Step size
+        
+    Returns:
+        Approximation of the integral
+    """
+    # Simpson's formula: h/3 * (f(a) + 4*sum(f_odd) + 2*sum(f_even) + f(b)),
+    # evaluated as a single dot product with the cached weight vector
+    result = (h / 3) * np.dot(simpson_weights(len(y) - 1), y)
+    return float(result)
+
+
+def gauss_legendre_from_samples(y: np.ndarray, h: float) -> float:
+    """
+    Apply the composite Gauss-Legendre rule to samples at the Gauss nodes.
+    
+    Args:
+        y: Function values with shape (n, GAUSS_POINTS), one row per subinterval
+        h: Subinterval width
+        
+    Returns:
+        Approximation of the integral
+    """
+    result = (h / 2) * np.sum(y @ _GAUSS_WEIGHTS)
+    return float(result)
+
 
 def trapezoidal_rule(func: Callable[[float], float], a: float, b: float, n: int) -> float:
     """
@@ -33,12 +231,9 @@ def trapezoidal_rule(func: Callable[[float], float], a: float, b: float, n: int)
         Approximation of the integral
     """
     h = (b - a) / n
-    x = np.linspace(a, b, n + 1)
-    y = np.array([func(xi) for xi in x])
+    y = sample_function(func, uniform_grid(a, b, n))
     
-    # Trapezoidal formula: h/2 * (f(a) + 2*sum(f(x_i)) + f(b))
-    result = (h / 2) * (y[0] + 2 * np.sum(y[1:-1]) + y[-1])
-    return float(result)
+    return trapezoidal_from_samples(y, h)
 
 
 def midpoint_rule(func: Callable[[float], float], a: float, b: float, n: int) -> float:
@@ -63,11 +258,9 @@ def midpoint_rule(func: Callable[[float], float], a: float, b: float, n: int) ->
     """
     h = (b - a) / n
     # Midpoints of each subinterval
-    midpoints = np.array([a + (i + 0.5) * h for i in range(n)])
-    y = np.array([func(xi) for xi in midpoints])
+    y = sample_function(func, midpoint_grid(a, b, n))
     
-    result = h * np.sum(y)
-    return float(result)
+    return midpoint_from_samples(y, h)
 
 
 def simpsons_rule(func: Callable[[float], float], a: float, b: float, n: int) -> float:
@@ -94,12 +287,123 @@ def simpsons_rule(func: Callable[[float], float], a: float, b: float, n: int) ->
         n += 1
     
     h = (b - a) / n
-    x = np.linspace(a, b, n + 1)
-    y = np.array([func(xi) for xi in x])
+    y = sample_function(func, uniform_grid(a, b, n))
     
-    # Simpson's formula: h/3 * (f(a) + 4*sum(f_odd) + 2*sum(f_even) + f(b))
-    result = (h / 3) * (y[0] + 4 * np.sum(y[1:-1:2]) + 2 * np.sum(y[2:-1:2]) + y[-1])
-    return float(result)
+    return simpson_from_samples(y, h)
+
+
+def gauss_legendre_rule(func: Callable[[float], float], a: float, b: float, n: int) -> float:
+    """
+    Approximate the integral of func from a to b using composite Gauss-Legendre.
+    
+    Each of the n subintervals is integrated with the 10-point Gauss-Legendre
+    rule, which is exact for polynomials up to degree 19. For smooth functions
+    it reaches a given accuracy with far fewer evaluations than Simpson's Rule.
+    
+    Formula: (h/2) * sum over subintervals of sum(w_j * f(c_i + (h/2) * t_j))
+    where h = (b-a)/n, c_i are the subinterval centres and (t_j, w_j) the
+    nodes and weights on [-1, 1]
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound of integration
+        b: Upper bound of integration
+        n: Number of subintervals
+        
+    Returns:
+        Approximation of the integral
+    """
+    h, x = _method_grid(a, b, n, "gauss")
+    y = sample_function(func, x)
+    
+    return gauss_legendre_from_samples(y, h)
+
+
+def adaptive_simpson(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    tol: float = 1e-8,
+    min_depth: int = 3,
+    max_depth: int = 50,
+    max_evals: int = ADAPTIVE_MAX_EVALS
+) -> Tuple[float, int]:
+    """
+    Approximate the integral of func from a to b using adaptive Simpson's Rule.
+    
+    Each panel is split in half and Simpson's rule is applied to both halves.
+    If |S(left) + S(right) - S(whole)| <= 15 * tol the panel is accepted
+    (with the Richardson correction), otherwise both halves are refined
+    recursively with half the tolerance. Function values are reused between
+    levels, so every refinement costs two new evaluations.
+    
+    A difference below the rounding noise of the panel, measured on
+    Simpson's rule applied to |f|, also counts as converged; measuring it on
+    |S(left) + S(right)| instead would never accept panels whose integral
+    cancels to about 0. Once max_evals function evaluations are spent, the
+    remaining panels are accepted as they are.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound of integration
+        b: Upper bound of integration
+        tol: Absolute error tolerance, raised to ADAPTIVE_MIN_TOL if smaller
+        min_depth: Number of levels that are always refined, so samples that
+            happen to coincide (e.g. a periodic function sampled at its
+            period) cannot stop the recursion early
+        max_depth: Maximum recursion depth
+        max_evals: Maximum number of function evaluations
+        
+    Returns:
+        Tuple of (integral approximation, number of subintervals used)
+    """
+    eps = np.finfo(float).eps
+    evaluations = 0
+    
+    # Evaluate at NumPy scalars so 1/0, sqrt(-1) etc. give inf/NaN exactly as in
+    # the array-based rules, instead of raising on plain Python floats
+    def f(x: float) -> float:
+        nonlocal evaluations
+        evaluations += 1
+        return float(func(np.float64(x)))
+    
+    def simpson(fa: float, fm: float, fb: float, width: float) -> float:
+        return (width / 6) * (fa + 4 * fm + fb)
+    
+    def refine(
+        a: float, b: float,
+        fa: float, fm: float, fb: float,
+        whole: float, tol: float, depth: int
+    ) -> Tuple[float, int]:
+        m = (a + b) / 2
+        lm, rm = (a + m) / 2, (m + b) / 2
+        flm, frm = f(lm), f(rm)
+        left = simpson(fa, flm, fm, m - a)
+        right = simpson(fm, frm, fb, b - m)
+        delta = left + right - whole
+        noise = 64 * eps * simpson(abs(fa), abs(fm), abs(fb), b - a)
+        
+        # Converged, cannot be split any further, or the difference is
+        # pure rounding noise
+        converged = (
+            not np.isfinite(delta)
+            or lm <= a or rm >= b
+            or abs(delta) <= max(15 * tol, noise)
+        )
+        if (
+            depth <= 0
+            or evaluations >= max_evals
+            or (converged and depth <= max_depth - min_depth)
+        ):
+            return left + right + delta / 15, 4
+        
+        left_val, left_count = refine(a, m, fa, flm, fm, left, tol / 2, depth - 1)
+        right_val, right_count = refine(m, b, fm, frm, fb, right, tol / 2, depth - 1)
+        return left_val + right_val, left_count + right_count
+    
+    tol = max(tol, ADAPTIVE_MIN_TOL)
+    fa, fm, fb = f(a), f((a + b) / 2), f(b)
+    return refine(a, b, fa, fm, fb, simpson(fa, fm, fb, b - a), tol, max_depth)
 
 
 def exact_integral(func: Callable[[float], float], a: float, b: float) -> Tuple[float, float]:
@@ -116,88 +420,151 @@ def exact_integral(func: Callable[[float], float], a: float, b: float) -> Tuple[
     Returns:
         Tuple of (integral value, estimated error)
     """
-    result, error = integrate.quad(func, a, b)
+    # NumPy scalars, as in adaptive_simpson: invalid points give NaN, not errors
+    result, error = integrate.quad(lambda x: func(np.float64(x)), a, b)
     return float(result), float(error)
 
 
+@lru_cache(maxsize=512)
+def _cached_exact_integral(
+    function_id: str | None,
+    custom_expression: str | None,
+    a: float,
+    b: float
+) -> Tuple[float, float]:
+    func = resolve_function(function_id, custom_expression)
+    return exact_integral(func, a, b)
+
+
+def cached_exact_integral(
+    function_id: str | None,
+    custom_expression: str | None,
+    a: float,
+    b: float
+) -> Tuple[float, float]:
+    """
+    Memoized exact_integral keyed by the function ID (or raw custom expression)
+    and the bounds.
+    
+    A UI session keeps re-requesting the same function over the same interval
+    while changing only n, the method or the n values, so repeated scipy.quad
+    calls are served from the cache. /calculate, /analyze and /analyze/stream
+    all go through here. The key is normalized (a custom expression is ignored
+    when a function ID is given, bounds are floats) so they share entries with
+    each other and with warm_exact_integral_cache.
+    
+    Args:
+        function_id: ID of a predefined function, takes precedence if given
+        custom_expression: Custom expression used when no function ID is given
+        a: Lower bound of integration
+        b: Upper bound of integration
+        
+    Returns:
+        Tuple of (integral value, estimated error)
+    """
+    if function_id:
+        custom_expression = None
+    return _cached_exact_integral(function_id, custom_expression, float(a), float(b))
+
+
+def warm_exact_integral_cache() -> None:
+    """
+    Precompute the exact integral of every library function over its
+    default interval, which is what the UI requests on first load.
+    """
+    for function_id, info in FUNCTIONS.items():
+        cached_exact_integral(function_id, None, info["default_a"], info["default_b"])
+
+
+warm_exact_integral_cache()
+
+
 def get_visualization_data(
     func: Callable[[float], float],
     a: float,
     b: float,
     n: int,
     method: str,
-    num_curve_points: int = 200
+    num_curve_points: int = 200,
+    max_shapes: int = 200
 ) -> Dict[str, Any]:
     """
     Generate data for visualizing the numerical integration method.
     
+    The curve always has num_curve_points points regardless of n. Shapes are
+    one per subinterval, so above max_shapes subintervals (too thin to render)
+    none are returned and the payload stays small.
+    
     Args:
         func: The function to integrate
         a: Lower bound
         b: Upper bound
         n: Number of subintervals
-        method: 'trapezoidal', 'midpoint', or 'simpson'
+        method: 'trapezoidal', 'midpoint', 'simpson', or 'gauss'
+            (Gauss-Legendre has no shapes to draw)
         num_curve_points: Number of points for the smooth curve
+        max_shapes: Largest n for which shape data is generated
         
     Returns:
         Dictionary containing curve points and shape data for visualization
     """
     h = (b - a) / n
     
-    # Generate smooth curve points
+    # Generate smooth curve points (tolist() yields Python floats directly)
     curve_x = np.linspace(a, b, num_curve_points)
-    curve_y = np.array([func(xi) for xi in curve_x])
+    curve_y = sample_function(func, curve_x)
+    
+    curve_points = [
+        {"x": x, "y": y} for x, y in zip(curve_x.tolist(), curve_y.tolist())
+    ]
     
-    curve_points = [{"x": float(x), "y": float(y)} for x, y in zip(curve_x, curve_y)]
+    # Subintervals this thin cannot be drawn individually
+    if n > max_shapes:
+        return {
+            "curve": curve_points,
+            "shapes": [],
+        }
     
     # Generate shape data based on method
     shapes = []
     
     if method == "trapezoidal":
         # Trapezoids
-        x_points = np.linspace(a, b, n + 1)
-        for i in range(n):
-            x0, x1 = x_points[i], x_points[i + 1]
-            y0, y1 = func(x0), func(x1)
-            shapes.append({
-                "type": "trapezoid",
-                "x0": float(x0),
-                "x1": float(x1),
-                "y0": float(y0),
-                "y1": float(y1),
-            })
+        x_points = uniform_grid(a, b, n)
+        xs = x_points.tolist()
+        ys = sample_function(func, x_points).tolist()
+        shapes = [
+            {"type": "trapezoid", "x0": x0, "x1": x1, "y0": y0, "y1": y1}
+            for x0, x1, y0, y1 in zip(xs, xs[1:], ys, ys[1:])
+        ]
     
     elif method == "midpoint":
         # Rectangles at midpoints
-        for i in range(n):
-            x0 = a + i * h
-            x1 = x0 + h
-            mid = (x0 + x1) / 2
-            y_mid = func(mid)
-            shapes.append({
-                "type": "rectangle",
-                "x0": float(x0),
-                "x1": float(x1),
-                "y": float(y_mid),
-            })
+        left = a + np.arange(n) * h
+        right = left + h
+        y_mids = sample_function(func, midpoint_grid(a, b, n))
+        shapes = [
+            {"type": "rectangle", "x0": x0, "x1": x1, "y": y}
+            for x0, x1, y in zip(left.tolist(), right.tolist(), y_mids.tolist())
+        ]
     
     elif method == "simpson":
         # Simpson's uses parabolas, we'll show as filled areas
         if n % 2 != 0:
             n += 1
-        x_points = np.linspace(a, b, n + 1)
-        for i in range(0, n, 2):
-            x0, x1, x2 = x_points[i], x_points[i + 1], x_points[i + 2]
-            y0, y1, y2 = func(x0), func(x1), func(x2)
-            shapes.append({
+        x_points = uniform_grid(a, b, n)
+        xs = x_points.tolist()
+        ys = sample_function(func, x_points).tolist()
+        shapes = [
+            {
                 "type": "parabola",
-                "x0": float(x0),
-                "x1": float(x1),
-                "x2": float(x2),
-                "y0": float(y0),
-                "y1": float(y1),
-                "y2": float(y2),
-            })
+                "x0": x0, "x1": x1, "x2": x2,
+                "y0": y0, "y1": y1, "y2": y2,
+            }
+            for x0, x1, x2, y0, y1, y2 in zip(
+                xs[0::2], xs[1::2], xs[2::2], ys[0::2], ys[1::2], ys[2::2]
+            )
+        ]
     
     return {
         "curve": curve_points,
@@ -205,6 +572,87 @@ def get_visualization_data(
     }
 
 
+_FROM_SAMPLES = {
+    "trapezoidal": trapezoidal_from_samples,
+    "midpoint": midpoint_from_samples,
+    "simpson": simpson_from_samples,
+    "gauss": gauss_legendre_from_samples,
+}
+
+
+def compute_integrals_batch(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    n_list: List[int],
+    method: str
+) -> List[float]:
+    """
+    Compute the integral for several n values with a single call to func.
+    
+    The sample points of every n are packed into one contiguous array, func
+    is evaluated on it once, and each n is then reduced from its own slice.
+    This amortizes the per-call overhead of func (one ufunc dispatch per
+    operator) across the whole convergence sweep.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        n_list: Numbers of subintervals, one result per entry
+        method: 'trapezoidal', 'midpoint', 'simpson', or 'gauss'
+        
+    Returns:
+        List of approximations in the order of n_list
+    """
+    grids = [_method_grid(a, b, n, method) for n in n_list]
+    if not grids:
+        return []
+    
+    offsets = np.cumsum([0] + [x.size for _, x in grids])
+    y_all = sample_function(func, np.concatenate([x.ravel() for _, x in grids]))
+    
+    reduce = _FROM_SAMPLES[method]
+    return [
+        reduce(y_all[start:stop].reshape(x.shape), h)
+        for (h, x), start, stop in zip(grids, offsets[:-1], offsets[1:])
+    ]
+
+
+def compute_integrals_parallel(
+    func: Callable[[float], float],
+    a: float,
+    b: float,
+    n_list: List[int],
+    method: str
+) -> List[float]:
+    """
+    Compute the integral for several n values concurrently in a thread pool.
+    
+    NumPy releases the GIL inside the ufuncs and reductions, so independent
+    n values overlap on multiple cores. Unlike compute_integrals_batch this
+    never materializes all grids at once, which suits a few very large n.
+    
+    Args:
+        func: The function to integrate
+        a: Lower bound
+        b: Upper bound
+        n_list: Numbers of subintervals, one result per entry
+        method: 'trapezoidal', 'midpoint', 'simpson', or 'gauss'
+        
+    Returns:
+        List of approximations in the order of n_list
+    """
+    if not n_list:
+        return []
+    
+    max_workers = min(len(n_list), os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(
+            lambda n: compute_integral(func, a, b, n, method), n_list
+        ))
+
+
 def compute_integral(
     func: Callable[[float], float],
     a: float,
@@ -220,7 +668,7 @@ def compute_integral(
         a: Lower bound
         b: Upper bound
         n: Number of subintervals
-        method: 'trapezoidal', 'midpoint', or 'simpson'
+        method: 'trapezoidal', 'midpoint', 'simpson', or 'gauss'
         
     Returns:
         Approximation of the integral
@@ -231,5 +679,7 @@ def compute_integral(
         return midpoint_rule(func, a, b, n)
     elif method == "simpson":
         return simpsons_rule(func, a, b, n)
+    elif method == "gauss":
+        return gauss_legendre_rule(func, a, b, n)
     else:
         raise ValueError(f"Unknown method: {method}")
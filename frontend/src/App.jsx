@@ -13,7 +13,7 @@ import Deliverables from './components/Deliverables/Deliverables';
 import { HelpOverlay, HelpButton } from './components/Help/HelpGuide';
 
 // API
-import { getFunctions, calculate, analyze } from './services/api';
+import { getFunctions, calculate, analyzeStream } from './services/api';
 
 function App() {
   // State
@@ -54,6 +54,33 @@ function App() {
     }
   };
 
+  // Stream the convergence analysis so the plots and table fill in row by row
+  const runAnalysis = (requestBase) =>
+    analyzeStream(
+      {
+        ...requestBase,
+        methods: selectedMethods,
+        a: bounds.a,
+        b: bounds.b,
+        n_values: [4, 8, 16, 32, 64, 128, 256, 512, 1024],
+      },
+      ({ type, ...record }) => {
+        if (type === 'start') {
+          setAnalysisData({ ...record, results: {}, winner: null, improvements: {}, win_counts: {} });
+        } else if (type === 'result') {
+          const { method, ...row } = record;
+          setAnalysisData((prev) => ({
+            ...prev,
+            results: { ...prev.results, [method]: [...(prev.results[method] || []), row] },
+          }));
+        } else if (type === 'summary') {
+          setAnalysisData((prev) => ({ ...prev, ...record }));
+        } else if (type === 'error') {
+          throw new Error(record.detail);
+        }
+      }
+    );
+
   const handleFunctionSelect = (func) => {
     setSelectedFunction(func);
     setUseCustomFunction(false);
@@ -99,16 +126,9 @@ function App() {
       setCalculateData(calcResponse);
 
       // Get full convergence analysis
-      const analyzeResponse = await analyze({
-        ...requestBase,
-        methods: selectedMethods,
-        a: bounds.a,
-        b: bounds.b,
-        n_values: [4, 8, 16, 32, 64, 128, 256, 512, 1024],
-      });
-      setAnalysisData(analyzeResponse);
+      await runAnalysis(requestBase);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Analysis failed. Please check your expression.');
+      setError(err.response?.data?.detail || err.message || 'Analysis failed. Please check your expression.');
       console.error(err);
     } finally {
       setLoading(false);
@@ -145,16 +165,9 @@ function App() {
       setCalculateData(calcResponse);
 
       // Get full convergence analysis
-      const analyzeResponse = await analyze({
-        ...requestBase,
-        methods: selectedMethods,
-        a: bounds.a,
-        b: bounds.b,
-        n_values: [4, 8, 16, 32, 64, 128, 256, 512, 1024],
-      });
-      setAnalysisData(analyzeResponse);
+      await runAnalysis(requestBase);
     } catch (err) {
-      setError(err.response?.data?.detail || 'Analysis failed. Please try again.');
+      setError(err.response?.data?.detail || err.message || 'Analysis failed. Please try again.');
       console.error(err);
     } finally {
       setLoading(false);
@@ -48,4 +48,36 @@ export const analyze = async (params) => {
     return response.data;
 };
 
+/**
+ * Perform convergence analysis, receiving results as they are computed
+ * @param {Object} params - Same parameters as analyze()
+ * @param {Function} onRecord - Called with each record ('start', 'result', 'summary' or 'error')
+ * @param {AbortSignal} [signal] - Optional signal to cancel the analysis
+ */
+export const analyzeStream = async (params, onRecord, signal) => {
+    const response = await fetch(`${API_BASE_URL}/analyze/stream`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify(params),
+        signal,
+    });
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({}));
+        throw new Error(error.detail || `Request failed with status ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    for (;;) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const lines = buffer.split('\n');
+        buffer = lines.pop();
+        lines.filter(Boolean).forEach((line) => onRecord(JSON.parse(line)));
+    }
+    if (buffer.trim()) onRecord(JSON.parse(buffer));
+};
+
 export default api;